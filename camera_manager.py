@@ -1,12 +1,124 @@
+import asyncio
+import mmap
+import os
+import re
+import sys
 import threading
 import time
 import cv2
+import numpy as np
+
+# import 시 한 번만 계산하는 상수(호출마다 fourcc 변환/속성 ID 조회를 하지 않도록)
+_FOURCC_MJPG = cv2.VideoWriter_fourcc(*"MJPG")
+_FOURCC_YUYV = cv2.VideoWriter_fourcc(*"YUYV")
+_FOURCCS = {"MJPG": _FOURCC_MJPG, "YUYV": _FOURCC_YUYV}
+
+# V4L2 white balance temperature (cv2.CAP_PROP_WB_TEMPERATURE)
+_CAP_PROP_WB_TEMPERATURE = 23
+
+# 2MB huge page. mmap 모듈이 MAP_HUGETLB를 노출하지 않는 버전이 있어 Linux 값으로 대체
+_HUGE_PAGE = 2 * 1024 * 1024
+_MAP_HUGETLB = getattr(
+    mmap, "MAP_HUGETLB", 0x40000 if sys.platform.startswith("linux") else 0
+)
+
+# OPENCV_FFMPEG_CAPTURE_OPTIONS는 프로세스 전역 환경변수라 open 동안만 설정하고 복원
+_FFMPEG_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_FFMPEG_ENV_LOCK = threading.Lock()
+
+# setter 키 -> cv2 속성 ID
+_PROPS = {
+    "white_balance_temperature": _CAP_PROP_WB_TEMPERATURE,
+    "exposure": cv2.CAP_PROP_EXPOSURE,
+    "gain": cv2.CAP_PROP_GAIN,
+    "focus": cv2.CAP_PROP_FOCUS,  # 0~255
+    "zoom": cv2.CAP_PROP_ZOOM,
+}
+
+
+def _huge_buf(shape, dtype=np.uint8) -> np.ndarray:
+    """
+    huge page 기반 ndarray 할당(프레임 버퍼용, TLB miss 감소).
+    MAP_HUGETLB(예약된 hugetlb 페이지) -> 익명 mmap + MADV_HUGEPAGE(THP) -> np.empty 순으로 시도합니다.
+    """
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape))
+    size = (count * dtype.itemsize + _HUGE_PAGE - 1) & ~(_HUGE_PAGE - 1)
+
+    m = None
+    if _MAP_HUGETLB:
+        try:
+            m = mmap.mmap(
+                -1, size, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS | _MAP_HUGETLB
+            )
+        except OSError:  # hugetlb 페이지가 예약되어 있지 않음(vm.nr_hugepages=0)
+            m = None
+    if m is None and hasattr(mmap, "MADV_HUGEPAGE"):
+        try:
+            m = mmap.mmap(-1, size, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+            m.madvise(mmap.MADV_HUGEPAGE)
+        except OSError:
+            m = None
+    if m is None:
+        return np.empty(shape, dtype=dtype)
+
+    return np.frombuffer(m, dtype=dtype, count=count).reshape(shape)
+
+
+class CaptureMetrics:
+    """
+    캡처/전송 계측 카운터(/metrics 노출용, 단조 증가).
+    - 각 카운터는 쓰는 스레드가 하나뿐이라(캡처 스레드 또는 이벤트 루프) lock 없이 += 로 갱신합니다.
+      읽는 쪽은 조금 지난 값을 볼 수는 있어도 깨진 값을 보지는 않습니다.
+    """
+
+    HELP = {
+        "frames_grabbed": "Frames grabbed from the driver",
+        "frames_captured": "Frames retrieved (decoded) and published",
+        "frames_served": "MJPEG parts sent to clients",
+        "frames_dropped": "Queued MJPEG parts dropped because a subscriber was behind",
+        "grab_failures": "Failed cap.grab() calls",
+        "encode_failures": "Frames that failed to encode",
+        "capture_ns": "Nanoseconds spent in cap.retrieve()",
+        "encode_ns": "Nanoseconds spent encoding MJPEG parts",
+    }
+
+    def __init__(self):
+        self.frames_grabbed = 0
+        self.frames_captured = 0
+        self.frames_served = 0
+        self.frames_dropped = 0
+        self.grab_failures = 0
+        self.encode_failures = 0
+        self.capture_ns = 0
+        self.encode_ns = 0
+
+    def snapshot(self) -> dict:
+        return {name: getattr(self, name) for name in self.HELP}
 
 
 class CameraManager:
     """
-    - 별도 스레드에서 USB 카메라 프레임을 지속적으로 읽어 last_frame에 최신 프레임을 저장합니다.
-    - 다른 스레드(StreamingResponse generator 등)에서 last_frame을 안전하게 읽을 수 있도록 lock을 제공합니다.
+    - 별도 스레드에서 USB 카메라 프레임을 지속적으로 읽어 구독자에게 인코딩된 청크로 전달합니다.
+    - lock은 start/stop 및 cap 수명주기(open/release, cap 참조 교체)에만 사용합니다.
+      setter는 lock 없이 cap 참조를 한 번 읽어 사용합니다. cap.set()과 캡처 스레드의
+      grab()/retrieve()가 겹쳐도 V4L2 드라이버가 ioctl을 직렬화하며, 한 프레임 정도
+      값이 섞이는 것은 제어용 동작이라 무해합니다.
+    - 캡처 스레드는 매 프레임 grab()만 하고, 구독자가 있고 max_fps 간격이 지났을 때만
+      retrieve()로 디코드/색변환을 수행합니다.
+    - retrieve()는 미리 할당한 2개의 버퍼(_buf)에 번갈아 디코드합니다(더블 버퍼).
+      인코딩은 캡처 스레드에서 다음 retrieve() 전에 끝나므로 버퍼가 외부로 노출되지 않습니다.
+    - MJPEG 스트림은 push 방식입니다. 구독자(subscribe())가 있으면 캡처 스레드가 프레임을
+      encode_chunk로 한 번만 인코딩하고, loop.call_soon_threadsafe로 이벤트 루프에 넘겨
+      구독자별 asyncio.Queue에 넣습니다(가득 차면 가장 오래된 청크를 버림).
+      마지막 청크는 구독자가 있는 동안 캐시해 두었다가 require_new=False로 구독하면 바로 보냅니다.
+    - hw_decode=True이고 fourcc가 MJPG면 FFmpeg 백엔드 + VAAPI로 JPEG 디코드를 먼저 시도하고,
+      실패하면 V4L2 백엔드로 폴백합니다.
+    - raw_mjpeg=True이고 fourcc가 MJPG면(V4L2 경로) CONVERT_RGB를 끄고 드라이버의 MJPEG 버퍼를
+      디코드 없이 그대로 받습니다. 이때 frame_is_jpeg가 True가 되고, encode_chunk에는
+      BGR 배열 대신 1차원 uint8 JPEG 배열이 전달되므로 재인코딩도 필요 없습니다.
+    - 주요 속성은 캡처 스레드가 주기적으로(또는 setter 호출 직후) 읽어 _props_snapshot에
+      통째로 교체 게시합니다. get_props()는 lock/ioctl 없이 이 스냅샷을 반환합니다.
     """
 
     def __init__(
@@ -15,19 +127,49 @@ class CameraManager:
         width: int = 1920,  # 4096,
         height: int = 1080,  # 2160,
         prefer_backend: int = cv2.CAP_V4L2,
-        fourcc: str = "YUYV",  # "MJPG",
+        fourcc: str = "MJPG",  # "YUYV",
+        max_fps: float = 30.0,
+        hw_decode: bool = False,
+        raw_mjpeg: bool = False,
+        vaapi_device: str = "/dev/dri/renderD128",
     ):
         self.cap = None
         self.lock = threading.Lock()
         self.running = False
-        self.last_frame = None
         self.thread = None
 
+        # push 구독자: 이벤트 루프 스레드에서만 추가/삭제/순회(캡처 스레드는 비었는지만 확인)
+        # encode_chunk: frame -> 전송할 bytes (main.py에서 지정)
+        self._subscribers: set[asyncio.Queue] = set()
+        self._last_chunk = None
+        self._loop = None
+        self.encode_chunk = None
+
+        self.metrics = CaptureMetrics()
+
+        # retrieve() 출력 더블 버퍼(카메라 오픈 시 실제 해상도로 할당)
+        self._buf = [None, None]
+        self._idx = 0
+
+        # 속성 스냅샷(읽기 전용 dict, 참조 교체로 게시) + setter 호출 후 갱신 요청 플래그
+        self._props_snapshot: dict = {}
+        self._props_dirty = False
+
         self.device_index = device_index
         self.width = width
         self.height = height
         self.prefer_backend = prefer_backend
         self.fourcc = fourcc
+        self._fourcc_code = (
+            _FOURCCS.get(fourcc) or cv2.VideoWriter_fourcc(*fourcc) if fourcc else None
+        )
+        self.max_fps = max_fps
+        self.hw_decode = hw_decode
+        self.raw_mjpeg = raw_mjpeg
+        # 실제로 raw MJPEG 수신이 적용되었는지(카메라 오픈 시 결정)
+        self.frame_is_jpeg = False
+        self.vaapi_device = vaapi_device
+        self.props_refresh_frames = 30
 
     def start(self):
         """캡처 스레드를 시작합니다(이미 실행 중이면 무시)."""
@@ -54,17 +196,84 @@ class CameraManager:
                 except Exception:
                     pass
             self.cap = None
-            self.last_frame = None
+        self._buf = [None, None]
+        self._props_snapshot = {}
+
+    def _vaapi_hw_device(self) -> int:
+        """
+        vaapi_device 경로 -> OpenCV CAP_PROP_HW_DEVICE 값.
+        OpenCV는 VAAPI 장치 N을 /dev/dri/renderD(128+N)로 열며, -1이면 기본 장치를 사용합니다.
+        """
+        m = re.fullmatch(r"/dev/dri/renderD(\d+)", self.vaapi_device)
+        if m is None or int(m.group(1)) < 128:
+            return -1
+        return int(m.group(1)) - 128
+
+    def _open_camera_hw(self):
+        """
+        FFmpeg 백엔드로 /dev/videoN을 열고 MJPEG 디코드를 VAAPI(iGPU)에 맡깁니다.
+        V4L2 입력 옵션은 OPENCV_FFMPEG_CAPTURE_OPTIONS로 전달해야 하므로 open 동안만 설정합니다.
+        주의: 이 경로에서는 exposure/gain 등 V4L2 컨트롤을 cap.set()으로 바꿀 수 없습니다.
+        """
+        if not os.path.exists(self.vaapi_device):
+            return None
+
+        # input_format: OpenCV가 demuxer 이름으로 사용(av_find_input_format) -> v4l2 명시
+        # pixel_format: v4l2 demuxer에서 input_format과 같은 필드라 이후 값(mjpeg)이 적용됨
+        options = (
+            f"input_format;v4l2|pixel_format;mjpeg|video_size;{self.width}x{self.height}"
+        )
+        with _FFMPEG_ENV_LOCK:
+            prev = os.environ.get(_FFMPEG_ENV)
+            os.environ[_FFMPEG_ENV] = options
+            try:
+                cap = cv2.VideoCapture(
+                    f"/dev/video{self.device_index}",
+                    cv2.CAP_FFMPEG,
+                    [
+                        cv2.CAP_PROP_HW_ACCELERATION,
+                        cv2.VIDEO_ACCELERATION_VAAPI,
+                        cv2.CAP_PROP_HW_DEVICE,
+                        self._vaapi_hw_device(),
+                    ],
+                )
+            finally:
+                if prev is None:
+                    os.environ.pop(_FFMPEG_ENV, None)
+                else:
+                    os.environ[_FFMPEG_ENV] = prev
+
+        if not cap.isOpened():
+            cap.release()
+            return None
+
+        print(f"[CAM] ffmpeg hwaccel={cap.get(cv2.CAP_PROP_HW_ACCELERATION)}")
+        return cap
 
     def _open_camera(self):
+        self.frame_is_jpeg = False
+        if self.hw_decode and self.fourcc == "MJPG":
+            try:
+                cap = self._open_camera_hw()
+            except Exception as e:
+                print(f"[CAM] hw decode open failed, fallback to V4L2: {e}")
+                cap = None
+            if cap is not None:
+                return cap
+
         cap = cv2.VideoCapture(self.device_index, self.prefer_backend)
         if not cap.isOpened():
             cap.release()
             raise RuntimeError(f"Cannot open camera index={self.device_index}")
 
+        # V4L2 드라이버 버퍼를 1개로 제한(기본 ~4개면 오래된 프레임이 쌓여 지연 증가)
+        # 일부 드라이버는 FOURCC/해상도 설정 전에 지정해야 적용됨
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        print(f"[CAM] buffersize={cap.get(cv2.CAP_PROP_BUFFERSIZE)}")
+
         # MJPG 수신 설정(카메라가 지원하면 성능에 유리할 때가 많음)
-        if self.fourcc:
-            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self._fourcc_code is not None:
+            cap.set(cv2.CAP_PROP_FOURCC, self._fourcc_code)
 
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
@@ -72,6 +281,12 @@ class CameraManager:
         cap.set(cv2.CAP_PROP_AUTO_WB, 0)
         cap.set(cv2.CAP_PROP_AUTOFOCUS, 0)
 
+        # 디코드 없이 드라이버의 MJPEG 버퍼를 그대로 받음(retrieve()가 JPEG bytes 배열 반환)
+        if self.raw_mjpeg and self.fourcc == "MJPG":
+            cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            self.frame_is_jpeg = cap.get(cv2.CAP_PROP_CONVERT_RGB) == 0
+            print(f"[CAM] raw mjpeg={self.frame_is_jpeg}")
+
         return cap
 
     def _capture_loop(self):
@@ -81,107 +296,210 @@ class CameraManager:
             with self.lock:
                 self.running = False
                 self.cap = None
-                self.last_frame = None
+            self._props_snapshot = {}
+            self._close_subscribers()
             print(f"[CAM] open failed: {e}")
             return
 
-        with self.lock:
-            self.cap = cap
+        # 루프가 어떤 이유로 끝나도(예외 포함) cap 해제 + running 해제 + 구독자 종료 통지
+        try:
+            with self.lock:
+                self.cap = cap
+            self._props_snapshot = self._read_props(cap)
 
-        print("[CAM] capture started")
+            # 드라이버가 실제로 적용한 해상도 기준으로 더블 버퍼 할당(huge page 우선)
+            # raw MJPEG는 프레임마다 크기가 달라 OpenCV가 할당한 배열을 그대로 사용
+            if not self.frame_is_jpeg:
+                w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or self.width
+                h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or self.height
+                self._buf = [_huge_buf((h, w, 3), np.uint8) for _ in range(2)]
+                self._idx = 0
 
-        while True:
-            with self.lock:
-                if not self.running:
-                    break
+            print("[CAM] capture started")
+
+            # max_fps 게이트: 다음 retrieve 허용 시각(next_due)을 간격만큼 전진시킴.
+            # grab()은 프레임 도착 시각에 깨어나므로 "직전 retrieve 후 경과 시간"으로 비교하면
+            # 지터 때문에 센서 FPS == max_fps여도 프레임이 버려짐. next_due가 now보다 최대
+            # 한 간격까지만 뒤처지게 두면 평균은 max_fps로 제한되면서 지터는 흡수됨.
+            min_interval = 1.0 / self.max_fps if self.max_fps else 0.0
+            next_due = 0.0
+            metrics = self.metrics
+
+            # hot path: 프레임마다 lock을 잡지 않음(running/cap은 참조 읽기만)
+            while self.running:
                 cap_ref = self.cap
+                if cap_ref is None:
+                    break
+
+                # grab()은 드라이버 버퍼만 넘기고 디코드는 하지 않음
+                if not cap_ref.grab():
+                    metrics.grab_failures += 1
+                    time.sleep(0.01)
+                    continue
+
+                # 속성 스냅샷 갱신: N 프레임마다 또는 setter가 dirty 표시한 다음 tick
+                metrics.frames_grabbed += 1
+                if (
+                    self._props_dirty
+                    or metrics.frames_grabbed % self.props_refresh_frames == 0
+                ):
+                    self._props_dirty = False
+                    self._props_snapshot = self._read_props(cap_ref)
+
+                # 구독자가 없거나 max_fps 간격 이내면 버려질 프레임 -> 디코드 생략
+                if not self._subscribers:
+                    continue
+                now = time.monotonic()
+                if now < next_due:
+                    continue
 
-            if cap_ref is None:
-                break
+                t0 = time.perf_counter_ns()
+                if self.frame_is_jpeg:
+                    ok, frame = cap_ref.retrieve()
+                else:
+                    ok, frame = cap_ref.retrieve(self._buf[self._idx])
+                metrics.capture_ns += time.perf_counter_ns() - t0
+                if not ok:
+                    continue
+                next_due = max(next_due + min_interval, now - min_interval)
+                metrics.frames_captured += 1
 
-            ok, frame = cap_ref.read()
-            if not ok:
-                time.sleep(0.01)
-                continue
+                if not self.frame_is_jpeg:
+                    # shape/dtype가 다르면 OpenCV가 새 배열을 반환 -> 다음부터 그 배열을 재사용
+                    self._buf[self._idx] = frame
+                    self._idx ^= 1
 
+                # push: 인코딩은 여기서 한 번만, 분배는 이벤트 루프에서
+                # (다음 retrieve() 전에 인코딩이 끝나므로 더블 버퍼가 덮어써질 일이 없음)
+                # 인코딩/분배 예외로 캡처 스레드가 죽지 않도록 해당 프레임만 실패로 처리
+                if self._subscribers and self.encode_chunk is not None:
+                    t0 = time.perf_counter_ns()
+                    try:
+                        chunk = self.encode_chunk(frame)
+                        if chunk is not None:
+                            self._loop.call_soon_threadsafe(self._broadcast, chunk)
+                    except Exception as e:
+                        print(f"[CAM] encode failed: {e}")
+                        chunk = None
+                    metrics.encode_ns += time.perf_counter_ns() - t0
+                    if chunk is None:
+                        metrics.encode_failures += 1
+        except Exception as e:
+            print(f"[CAM] capture error: {e}")
+        finally:
+            print("[CAM] capture stopping")
             with self.lock:
-                self.last_frame = frame
+                self.running = False
+                try:
+                    if self.cap:
+                        self.cap.release()
+                except Exception:
+                    pass
+                self.cap = None
+            self._buf = [None, None]
+            self._props_snapshot = {}
+            self._close_subscribers()
 
-        print("[CAM] capture stopping")
-        with self.lock:
-            try:
-                if self.cap:
-                    self.cap.release()
-            except Exception:
-                pass
-            self.cap = None
-            self.last_frame = None
+    def subscribe(self, maxsize: int = 2, require_new: bool = True) -> asyncio.Queue:
+        """
+        push 구독 등록(이벤트 루프에서 호출). 큐에서 청크를 받고, None이면 스트림 종료.
+        require_new=False면 캐시된 마지막 청크를 먼저 넣어 다음 캡처를 기다리지 않게 합니다
+        (캐시는 다른 구독자가 보고 있는 동안에만 유지).
+        """
+        self._loop = asyncio.get_running_loop()
+        q = asyncio.Queue(maxsize=maxsize)
+        if not require_new and self._last_chunk is not None:
+            q.put_nowait(self._last_chunk)
+        self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue):
+        """push 구독 해제(이벤트 루프에서 호출)"""
+        self._subscribers.discard(q)
+        # 구독자가 없으면 캡처가 retrieve를 멈추므로 캐시 청크는 더 이상 최신이 아님
+        if not self._subscribers:
+            self._last_chunk = None
+
+    def subscriber_stats(self) -> tuple[int, int]:
+        """(구독자 수, 구독자 큐에 쌓인 청크 합계). 구독자 집합과 같은 이벤트 루프에서 호출"""
+        subscribers = self._subscribers
+        return len(subscribers), sum(q.qsize() for q in subscribers)
+
+    def _broadcast(self, chunk):
+        """이벤트 루프에서 실행: 모든 구독자 큐에 청크 전달(가득 차면 가장 오래된 것을 버림)"""
+        # 마지막 구독자가 나간 뒤 도착한 청크는 캐시하지 않음(unsubscribe 참고)
+        self._last_chunk = chunk if self._subscribers else None
+        for q in self._subscribers:
+            if q.full():
+                q.get_nowait()
+                if chunk is not None:
+                    self.metrics.frames_dropped += 1
+            q.put_nowait(chunk)
+
+    def _close_subscribers(self):
+        """캡처 종료 시 구독자에게 종료(None) 통지"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._broadcast, None)
+        except RuntimeError:
+            pass
 
     def _ensure_open(self):
-        """cap이 열려있지 않으면 예외"""
-        with self.lock:
-            if self.cap is None or not self.cap.isOpened():
-                raise RuntimeError("Camera is not started/opened")
+        """cap이 열려있지 않으면 예외, 열려 있으면 cap 참조를 반환(lock 없음)"""
+        cap = self.cap
+        if cap is None or not cap.isOpened():
+            raise RuntimeError("Camera is not started/opened")
+        return cap
+
+    def _set(self, prop_key: str, value: float) -> dict:
+        """_PROPS[prop_key] 속성을 설정하고 readback을 반환"""
+        prop = _PROPS[prop_key]
+        cap = self._ensure_open()
+        ok = cap.set(prop, float(value))
+        readback = cap.get(prop)
+        self._props_dirty = True
+        return {"ok": bool(ok), "requested": value, "applied": readback}
 
     def set_white_balance_temperature(self, value: float) -> dict:
         """white balance temperature 설정"""
-        self._ensure_open()
-        with self.lock:
-            ok = self.cap.set(23, float(value))
-            readback = self.cap.get(23)
-        return {"ok": bool(ok), "requested": value, "applied": readback}
+        return self._set("white_balance_temperature", value)
 
     def set_exposure(self, value: float) -> dict:
-        """
-        exposure 설정.
-        """
-        self._ensure_open()
-        with self.lock:
-            ok = self.cap.set(cv2.CAP_PROP_EXPOSURE, float(value))
-            readback = self.cap.get(cv2.CAP_PROP_EXPOSURE)
-        return {"ok": ok, "requested": value, "applied": readback}
+        """exposure 설정"""
+        return self._set("exposure", value)
 
     def set_gain(self, value: float) -> dict:
         """gain 설정"""
-        self._ensure_open()
-        with self.lock:
-            ok = self.cap.set(cv2.CAP_PROP_GAIN, float(value))
-            readback = self.cap.get(cv2.CAP_PROP_GAIN)
-        return {"ok": bool(ok), "requested": value, "applied": readback}
+        return self._set("gain", value)
 
     def set_focus(self, value: float) -> dict:
-        """
-        focus 설정.
-        """
-        self._ensure_open()
-        with self.lock:
-            ok = self.cap.set(cv2.CAP_PROP_FOCUS, float(value))  # 0~255
-            readback = self.cap.get(cv2.CAP_PROP_FOCUS)
-        return {"ok": bool(ok), "requested": value, "applied": readback}
+        """focus 설정(0~255)"""
+        return self._set("focus", value)
 
     def set_zoom(self, value: float) -> dict:
-        """
-        zoom 설정.
-        """
-        self._ensure_open()
-        with self.lock:
-            ok = self.cap.set(cv2.CAP_PROP_ZOOM, float(value))
-            readback = self.cap.get(cv2.CAP_PROP_ZOOM)
-        return {"ok": bool(ok), "requested": value, "applied": readback}
+        """zoom 설정"""
+        return self._set("zoom", value)
+
+    @staticmethod
+    def _read_props(cap) -> dict:
+        """cap에서 주요 속성을 읽어 새 dict로 반환(캡처 스레드 전용)"""
+        return {
+            "white_balance_auto": cap.get(cv2.CAP_PROP_AUTO_WB),
+            "white_balance": cap.get(_CAP_PROP_WB_TEMPERATURE),
+            "auto_exposure": cap.get(cv2.CAP_PROP_AUTO_EXPOSURE),
+            "exposure": cap.get(cv2.CAP_PROP_EXPOSURE),
+            "gain": cap.get(cv2.CAP_PROP_GAIN),
+            "autofocus": cap.get(cv2.CAP_PROP_AUTOFOCUS),
+            "focus": cap.get(cv2.CAP_PROP_FOCUS),
+            "zoom": cap.get(cv2.CAP_PROP_ZOOM),
+            "width": cap.get(cv2.CAP_PROP_FRAME_WIDTH),
+            "height": cap.get(cv2.CAP_PROP_FRAME_HEIGHT),
+        }
 
     def get_props(self) -> dict:
-        """현재 주요 속성 readback(디버깅/표시용)"""
-        self._ensure_open()
-        with self.lock:
-            return {
-                "white_balance_auto": self.cap.get(cv2.CAP_PROP_AUTO_WB),
-                "white_balance": self.cap.get(23),
-                "auto_exposure": self.cap.get(cv2.CAP_PROP_AUTO_EXPOSURE),
-                "exposure": self.cap.get(cv2.CAP_PROP_EXPOSURE),
-                "gain": self.cap.get(cv2.CAP_PROP_GAIN),
-                "autofocus": self.cap.get(cv2.CAP_PROP_AUTOFOCUS),
-                "focus": self.cap.get(cv2.CAP_PROP_FOCUS),
-                "zoom": self.cap.get(cv2.CAP_PROP_ZOOM),
-                "width": self.cap.get(cv2.CAP_PROP_FRAME_WIDTH),
-                "height": self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT),
-            }
+        """현재 주요 속성 readback(디버깅/표시용). 캡처 스레드가 게시한 스냅샷을 lock 없이 반환"""
+        if self.cap is None:
+            raise RuntimeError("Camera is not started/opened")
+        return self._props_snapshot
@@ -0,0 +1,169 @@
+import inspect
+import os
+from fractions import Fraction
+
+import cv2
+
+try:
+    import av
+except ImportError:  # PyAV 미설치 시 CPU 경로만 사용
+    av = None
+
+try:
+    from turbojpeg import TJPF_BGR, TJSAMP_422, TurboJPEG
+except ImportError:  # PyTurboJPEG 미설치 시 cv2.imencode 사용
+    TurboJPEG = None
+
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+
+def _vaapi_encode_supported(device: str) -> bool:
+    """PyAV로 mjpeg_vaapi 하드웨어 인코딩이 가능한 환경인지 확인"""
+    if av is None or not os.path.exists(device):
+        return False
+    # pip 휠 PyAV는 VAAPI 없이 빌드된 FFmpeg를 포함 -> 시스템 FFmpeg로 빌드한 PyAV 필요
+    if "mjpeg_vaapi" not in av.codecs_available:
+        return False
+    # 인코더 hwaccel(hw_frames_ctx 생성 + 소프트웨어 프레임 업로드)은
+    # VideoCodecContext.sw_format을 제공하는 PyAV 버전부터 지원
+    return hasattr(av.codec, "hwaccel") and hasattr(
+        av.video.codeccontext.VideoCodecContext, "sw_format"
+    )
+
+
+class JpegEncoder:
+    """
+    - BGR 프레임을 JPEG bytes로 인코딩합니다.
+    - VAAPI 렌더 노드(/dev/dri/renderD128)가 있고 PyAV가 mjpeg_vaapi 인코더와 인코딩용
+      hwaccel을 지원하면 mjpeg_vaapi(iGPU 고정 기능 인코더)를 사용합니다. PyAV가 VAAPI 장치에
+      hw_frames_ctx(nv12)를 만들고, BGR 프레임을 nv12로 변환해 업로드(hwupload)한 뒤 인코딩합니다.
+      생성 시 작은 해상도로 한 번 열어 보고, 실패하면 CPU 경로만 사용합니다.
+    - CPU 경로는 PyTurboJPEG(libjpeg-turbo SIMD, BGR 직접 입력, 4:2:2)가 있으면 그것을,
+      없으면 cv2.imencode를 사용합니다.
+    - TurboJPEG 경로는 해상도별 최악의 경우 크기로 출력 버퍼를 한 번 할당해 재사용합니다
+      (캡처 중 해상도는 거의 바뀌지 않으므로 정상 상태에서는 프레임당 할당 없음).
+      이때 반환값은 출력 버퍼의 memoryview이며 다음 encode() 호출 전까지만 유효합니다.
+    - 하드웨어 인코더 컨텍스트는 한 번 만들어 재사용하며, 해상도가 바뀔 때만 다시 만듭니다.
+    - 인코더 컨텍스트와 출력 버퍼를 공유하므로 스레드 안전하지 않습니다.
+      encode()는 한 스레드(캡처 스레드)에서만 호출합니다.
+    """
+
+    def __init__(self, quality: int = 85, device: str = VAAPI_DEVICE):
+        self.quality = quality
+        self.device = device
+
+        self._ctx = None
+        self._size = None
+        self._hw_enabled = _vaapi_encode_supported(device)
+        if self._hw_enabled:
+            try:
+                self._open_hw(320, 240)
+            except Exception as e:
+                print(f"[ENC] vaapi encoder unavailable, using CPU: {e}")
+                self._hw_enabled = False
+
+        self._tj = None
+        self._tj_out = None
+        self._tj_size = None
+        self._tj_dst_supported = False
+        if TurboJPEG is not None:
+            try:
+                self._tj = TurboJPEG()
+            except (OSError, RuntimeError) as e:  # libturbojpeg 공유 라이브러리를 찾지 못함
+                print(f"[ENC] turbojpeg unavailable, using cv2: {e}")
+            else:
+                # 구버전 PyTurboJPEG는 encode(dst=)가 없음 -> 프레임마다 새 bytes 할당
+                self._tj_dst_supported = (
+                    "dst" in inspect.signature(TurboJPEG.encode).parameters
+                )
+
+    @property
+    def backend(self) -> str:
+        if self._hw_enabled:
+            return "vaapi"
+        return "turbojpeg" if self._tj is not None else "cv2"
+
+    def encode(self, frame) -> bytes | memoryview | None:
+        """프레임을 JPEG로 인코딩합니다(bytes-like). 실패 시 None."""
+        if self._hw_enabled:
+            try:
+                return self._encode_hw(frame)
+            except Exception as e:
+                # 드라이버/PyAV 빌드가 VAAPI 인코딩을 지원하지 않으면 이후로는 CPU 경로만 사용
+                print(f"[ENC] vaapi encode failed, fallback to CPU: {e}")
+                self._hw_enabled = False
+                self._ctx = None
+
+        if self._tj is not None:
+            return self._encode_tj(frame)
+
+        ok, jpg = cv2.imencode(
+            ".jpg",
+            frame,
+            [
+                int(cv2.IMWRITE_JPEG_QUALITY),
+                self.quality,
+                int(cv2.IMWRITE_JPEG_OPTIMIZE),
+                0,
+            ],
+        )
+        if not ok:
+            return None
+        # tobytes() 복사 없이 imencode 출력 버퍼를 1차원 바이트 뷰로 그대로 반환
+        return memoryview(jpg).cast("B")
+
+    def _open_hw(self, width: int, height: int):
+        hwaccel = av.codec.hwaccel.HWAccel(device_type="vaapi", device=self.device)
+        ctx = av.CodecContext.create("mjpeg_vaapi", "w", hwaccel=hwaccel)
+        ctx.width = width
+        ctx.height = height
+        ctx.time_base = Fraction(1, 30)
+        # hw_frames_ctx의 소프트웨어 포맷. pix_fmt는 open() 시 PyAV가 vaapi로 설정
+        ctx.sw_format = "nv12"
+        # mjpeg_vaapi는 global_quality(1~100)를 JPEG 품질로 사용
+        ctx.options = {"global_quality": str(self.quality)}
+        ctx.open()
+        return ctx
+
+    def _encode_hw(self, frame) -> bytes | None:
+        height, width = frame.shape[:2]
+        if self._ctx is None or self._size != (width, height):
+            self._ctx = self._open_hw(width, height)
+            self._size = (width, height)
+            print(f"[ENC] vaapi encoder opened {width}x{height}")
+
+        # encode()가 sw_format(nv12) 변환 + VAAPI 서피스 업로드를 수행
+        vf = av.VideoFrame.from_ndarray(frame, format="bgr24")
+        packets = self._ctx.encode(vf)
+        if not packets:
+            return None
+        return bytes(packets[0])
+
+    def _encode_tj(self, frame) -> bytes | memoryview:
+        if self._tj_dst_supported:
+            height, width = frame.shape[:2]
+            if self._tj_size != (width, height):
+                if hasattr(self._tj, "buffer_size"):
+                    size = self._tj.buffer_size(frame, TJSAMP_422)
+                else:
+                    # tjBufSize(4:2:2)와 같은 상한: MCU(16x8) 패딩 기준 4 bytes/px + 2KB
+                    padded = ((width + 15) // 16 * 16) * ((height + 7) // 8 * 8)
+                    size = padded * 4 + 2048
+                self._tj_out = bytearray(size)
+                self._tj_size = (width, height)
+
+            _, n = self._tj.encode(
+                frame,
+                quality=self.quality,
+                pixel_format=TJPF_BGR,
+                jpeg_subsample=TJSAMP_422,
+                dst=self._tj_out,
+            )
+            return memoryview(self._tj_out)[:n]
+
+        return self._tj.encode(
+            frame,
+            quality=self.quality,
+            pixel_format=TJPF_BGR,
+            jpeg_subsample=TJSAMP_422,
+        )
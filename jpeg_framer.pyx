@@ -0,0 +1,30 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+MJPEG multipart 파트 조립(C 확장).
+빌드: cythonize -i jpeg_framer.pyx  (빌드하지 않으면 main.py가 Python 경로를 사용)
+"""
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize
+from libc.stdio cimport snprintf
+from libc.string cimport memcpy
+
+
+cdef const char* PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %zd\r\n\r\n"
+
+
+cpdef bytes frame_chunk(const unsigned char[::1] jpg):
+    """boundary + 헤더 + JPEG + CRLF를 bytes 하나로 반환(할당 1회, memcpy 1회)"""
+    cdef Py_ssize_t n = jpg.shape[0]
+    cdef char header[96]
+    cdef Py_ssize_t h = snprintf(header, sizeof(header), PART_HEADER, n)
+
+    cdef bytes out = PyBytes_FromStringAndSize(NULL, h + n + 2)
+    cdef char* p = PyBytes_AS_STRING(out)
+
+    with nogil:
+        memcpy(p, header, h)
+        if n:
+            memcpy(p + h, &jpg[0], n)
+        p[h + n] = 13  # \r
+        p[h + n + 1] = 10  # \n
+    return out
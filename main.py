@@ -1,18 +1,48 @@
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
-import time
-import cv2
-import json
+import orjson
 
 from camera_manager import CameraManager
+from jpeg_encoder import JpegEncoder
+
+try:
+    # Cython 확장(cythonize -i jpeg_framer.pyx)이 빌드되어 있으면 사용
+    from jpeg_framer import frame_chunk
+except ImportError:
+    frame_chunk = None
 
 app = FastAPI()
 templates = Jinja2Templates(directory="templates")
 
 # camera = CameraManager(device_index=0, width=4096, height=2160, fourcc="MJPG")
-camera = CameraManager(device_index=0, width=1920, height=1080, fourcc="YUYV")
+camera = CameraManager(device_index=0, width=1920, height=1080, fourcc="MJPG")
+# VAAPI 사용 가능 시 하드웨어 JPEG 인코딩, 아니면 cv2.imencode
+encoder = JpegEncoder(quality=85)
+
+# multipart 파트 헤더의 고정 부분(boundary + Content-Type + "Content-Length: ")
+PART_PREFIX = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+
+
+def encode_part(frame):
+    """프레임 -> multipart 파트 bytes(캡처 스레드에서 프레임당 한 번 호출)"""
+    if camera.frame_is_jpeg:
+        # raw_mjpeg 모드: 카메라가 이미 압축한 JPEG(1차원 uint8 배열) -> 재인코딩 없음
+        jpg_bytes = memoryview(frame).cast("B")
+    else:
+        jpg_bytes = encoder.encode(frame)
+    if jpg_bytes is None:
+        return None
+    if frame_chunk is not None:
+        return frame_chunk(jpg_bytes)
+    # 여러 구독자 큐가 같은 객체를 공유하므로 재사용 버퍼 대신 join으로 한 번에 할당
+    return b"".join(
+        (PART_PREFIX, b"%d" % len(jpg_bytes), b"\r\n\r\n", jpg_bytes, b"\r\n")
+    )
+
+
+camera.encode_chunk = encode_part
 
 
 @app.get("/")
@@ -20,6 +50,27 @@ def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+# value 하나를 받는 setter 메시지 -> CameraManager 메서드
+SETTERS = {
+    "set_white_balance_temperature": camera.set_white_balance_temperature,
+    "set_exposure": camera.set_exposure,
+    "set_gain": camera.set_gain,
+    "set_focus": camera.set_focus,
+    "set_zoom": camera.set_zoom,
+}
+
+# 인자 없는 수명주기 메시지
+ACTIONS = {
+    "camera_start": camera.start,
+    "camera_stop": camera.stop,
+}
+
+
+async def send_json(ws: WebSocket, obj: dict):
+    # 브라우저가 JSON.parse(ev.data)로 읽으므로 text 프레임으로 전송
+    await ws.send_text(orjson.dumps(obj).decode("utf-8"))
+
+
 @app.websocket("/ws/control")
 async def ws_control(ws: WebSocket):
     await ws.accept()
@@ -30,126 +81,47 @@ async def ws_control(ws: WebSocket):
             print(f"[WS] received:{msg_text}")
 
             try:
-                msg = json.loads(msg_text)
-            except json.JSONDecodeError:
-                await ws.send_json(
-                    {"type": "error", "error": "invalid_json", "raw": msg_text}
+                msg = orjson.loads(msg_text)
+            except orjson.JSONDecodeError:
+                await send_json(
+                    ws, {"type": "error", "error": "invalid_json", "raw": msg_text}
                 )
                 continue
 
             msg_type = msg.get("type")
             try:
-                if msg_type == "camera_start":
-                    camera.start()
-                    await ws.send_json({"type": "ack", "action": "camera_start"})
-                    continue
-
-                if msg_type == "camera_stop":
-                    camera.stop()
-                    await ws.send_json({"type": "ack", "action": "camera_stop"})
-                    continue
-
-                if msg_type == "set_white_balance_temperature":
-                    value = msg.get("value")
-                    if value is None:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "error": "missing_value",
-                                "for": "set_white_balance_temperature",
-                            }
-                        )
-                        continue
-                    result = camera.set_white_balance_temperature(float(value))
-                    await ws.send_json(
-                        {
-                            "type": "ack",
-                            "action": "set_white_balance_temperature",
-                            "result": result,
-                        }
-                    )
-                    continue
-
-                if msg_type == "set_exposure":
-                    value = msg.get("value")
-                    if value is None:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "error": "missing_value",
-                                "for": "set_exposure",
-                            }
-                        )
-                        continue
-                    result = camera.set_exposure(float(value))
-                    await ws.send_json(
-                        {"type": "ack", "action": "set_exposure", "result": result}
-                    )
+                if msg_type in ACTIONS:
+                    ACTIONS[msg_type]()
+                    await send_json(ws, {"type": "ack", "action": msg_type})
                     continue
 
-                if msg_type == "set_gain":
+                if msg_type in SETTERS:
                     value = msg.get("value")
                     if value is None:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "error": "missing_value",
-                                "for": "set_gain",
-                            }
+                        await send_json(
+                            ws,
+                            {"type": "error", "error": "missing_value", "for": msg_type},
                         )
                         continue
-                    result = camera.set_gain(float(value))
-                    await ws.send_json(
-                        {"type": "ack", "action": "set_gain", "result": result}
+                    result = SETTERS[msg_type](float(value))
+                    await send_json(
+                        ws, {"type": "ack", "action": msg_type, "result": result}
                     )
                     continue
 
-                if msg_type == "set_focus":
-                    value = msg.get("value")
-                    if value is None:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "error": "missing_value",
-                                "for": "set_focus",
-                            }
-                        )
-                        continue
-                    result = camera.set_focus(float(value))
-                    await ws.send_json(
-                        {"type": "ack", "action": "set_focus", "result": result}
-                    )
-                    continue
-
-                if msg_type == "set_zoom":
-                    value = msg.get("value")
-                    if value is None:
-                        await ws.send_json(
-                            {
-                                "type": "error",
-                                "error": "missing_value",
-                                "for": "set_zoom",
-                            }
-                        )
-                        continue
-                    result = camera.set_zoom(float(value))
-                    await ws.send_json(
-                        {"type": "ack", "action": "set_zoom", "result": result}
-                    )
-                    continue
-
-                await ws.send_json(
-                    {"type": "error", "error": "unknown_type", "msg_type": msg_type}
+                await send_json(
+                    ws, {"type": "error", "error": "unknown_type", "msg_type": msg_type}
                 )
 
             except Exception as e:
-                await ws.send_json(
+                await send_json(
+                    ws,
                     {
                         "type": "error",
                         "error": "exception",
                         "msg_type": msg_type,
                         "detail": str(e),
-                    }
+                    },
                 )
     except WebSocketDisconnect:
         print("[WS] client disconnected")
@@ -157,9 +129,44 @@ async def ws_control(ws: WebSocket):
         camera.stop()
 
 
+@app.get("/metrics")
+async def metrics():
+    """캡처/인코딩/전송 카운터(Prometheus text format)"""
+    # async: 구독자 집합을 이벤트 루프 스레드에서만 순회하도록 스레드풀에서 실행하지 않음
+    n_subscribers, queue_depth = camera.subscriber_stats()
+    lines = []
+    for name, value in camera.metrics.snapshot().items():
+        metric = f"camera_{name}_total"
+        lines.append(f"# HELP {metric} {camera.metrics.HELP[name]}")
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+
+    gauges = {
+        "camera_running": ("Capture thread running", int(camera.running)),
+        "camera_mjpeg_subscribers": ("Connected MJPEG subscribers", n_subscribers),
+        "camera_mjpeg_queue_depth": (
+            "MJPEG parts waiting in subscriber queues",
+            queue_depth,
+        ),
+    }
+    for metric, (help_text, value) in gauges.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value}")
+
+    lines.append("# HELP camera_jpeg_encoder_info Active JPEG encoder backend")
+    lines.append("# TYPE camera_jpeg_encoder_info gauge")
+    lines.append(f'camera_jpeg_encoder_info{{backend="{encoder.backend}"}} 1')
+
+    return PlainTextResponse(
+        "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/mjpeg")
-def mjpeg():
+def mjpeg(require_new: bool = True):
     # WS start/stop만 사용: 여기서는 카메라를 자동으로 켜지지 않음(보기 전용)
+    # require_new=false: 다음 캡처를 기다리지 않고 캐시된 최신 프레임부터 바로 전송
     with camera.lock:
         running = camera.running
     if not running:
@@ -167,34 +174,25 @@ def mjpeg():
             status_code=503, detail="Camera is not started. Use WS camera_start first."
         )
     return StreamingResponse(
-        mjpeg_generator(),
+        mjpeg_generator(require_new),
         media_type="multipart/x-mixed-replace; boundary=frame",
     )
 
 
-def mjpeg_generator():
-    boundary = b"--frame\r\n"
-    while True:
-        # "보기만" 모드: 캡처가 꺼지면 스트림도 종료
-        with camera.lock:
-            running = camera.running
-            frame = camera.last_frame
-
-        if not running:
-            break
-
-        if frame is None:
-            time.sleep(0.02)
-            continue
-
-        ok, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 100])
-        if not ok:
-            continue
-
-        jpg_bytes = jpg.tobytes()
-
-        yield boundary
-        yield b"Content-Type: image/jpeg\r\n"
-        yield f"Content-Length: {len(jpg_bytes)}\r\n\r\n".encode("utf-8")
-        yield jpg_bytes
-        yield b"\r\n"
+async def mjpeg_generator(require_new: bool = True):
+    # push 구독: 캡처 스레드가 인코딩한 청크를 큐에서 받아 그대로 전송
+    q = camera.subscribe(require_new=require_new)
+    try:
+        # 캡처 스레드는 종료 시 running=False 후 None을 보내므로, 구독 직후 한 번만 확인하면
+        # 이미 끝난 캡처에 구독해 영원히 기다리는 경우를 막을 수 있음(타임아웃 불필요)
+        if not camera.running:
+            return
+        while True:
+            chunk = await q.get()
+            if chunk is None:
+                break
+            yield chunk
+            # yield가 돌아오면 응답에 쓰인 것 -> 이벤트 루프만 갱신하므로 lock 불필요
+            camera.metrics.frames_served += 1
+    finally:
+        camera.unsubscribe(q)